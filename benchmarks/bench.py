@@ -0,0 +1,159 @@
+"""Benchmarks for pyTaguchi.
+
+Run with any working directory (the package is imported from this checkout):
+
+    python benchmarks/bench.py [--output results.json] [--quick]
+
+Each case reports the best and median wall time per call in seconds; the
+results are written as JSON so runs can be compared across versions.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy
+
+# Run as a script, sys.path[0] is benchmarks/: import the package from the
+# repository this file belongs to
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pyTaguchi import arrays
+from pyTaguchi.batch import TaguchiBatch
+from pyTaguchi.taguchi import Taguchi
+
+# (name, factors, levels) for the built-in arrays and larger generated ones
+BUILTIN = [("L4", 3, 2), ("L8", 7, 2), ("L9", 4, 3), ("L12", 11, 2), ("L16b", 5, 4)]
+GENERATED = [("L64(2^63)", 63, 2), ("L81(3^40)", 40, 3), ("L256(4^85)", 85, 4),
+             ("L128(2^127)", 127, 2)]
+# Cold "from pyTaguchi.taguchi import Taguchi", best of a few fresh
+# interpreters, in seconds. Typically 0.15-0.3 s, nearly all of it numpy;
+# an eager pandas import alone adds 0.7 s or more.
+IMPORT_LIMIT = 0.5
+
+def make(factors, levels):
+    tg = Taguchi()
+    for i in range(factors):
+        tg.add({"name": "Variable n.%d" % (i + 1), "values": list(range(10, 10 * (levels + 1), 10))})
+    return tg
+
+def measure(func, repeat, number):
+    times = timeit.repeat(func, repeat=repeat, number=number)
+    per_call = sorted(t / number for t in times)
+    return {"best": per_call[0], "median": per_call[len(per_call) // 2],
+            "repeat": repeat, "number": number}
+
+def import_time():
+    # Fresh interpreter per sample: cold import of the core module
+    code = ("import time; t = time.perf_counter(); "
+            "from pyTaguchi.taguchi import Taguchi; print(time.perf_counter() - t)")
+    return float(subprocess.check_output([sys.executable, "-c", code], cwd=ROOT))
+
+def check_design():
+    # Lazy stages still build after run() and record their output size
+    tg = make(4, 3)
+    tg.run()
+    assert tg.matrix.shape == (9, 4)
+    assert tg.stats[-1]["stage"] == "materialize" and tg.stats[-1]["size"] == tg.matrix.nbytes
+
+def check_import():
+    # Building a design must not pull in pandas or matplotlib; fresh
+    # interpreter so nothing is loaded beforehand
+    code = ("import sys; from pyTaguchi.taguchi import Taguchi; tg = Taguchi(); "
+            "tg.add({'name': 'a', 'values': [1, 2, 3]}); tg.add({'name': 'b', 'values': [1, 2, 3]}); "
+            "tg.run(randomize=True, seed=0); tg.matrix; "
+            "print(' '.join(m for m in ('pandas', 'matplotlib') if m in sys.modules))")
+    loaded = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT).decode().split()
+    assert not loaded, "Eagerly imported: %s" % ", ".join(loaded)
+    best = min(import_time() for _ in range(3))
+    assert best < IMPORT_LIMIT, "Import took %.3f s (limit %.1f s)" % (best, IMPORT_LIMIT)
+
+def bench_design(factors, levels, repeat, number):
+    tg = make(factors, levels)
+    tg.run()
+    return measure(lambda: (tg.run(), tg.matrix), repeat, number)
+
+def bench_df(factors, levels, repeat, number):
+    tg = make(factors, levels)
+    tg.run()
+
+    def build():
+        tg.generate_df()
+        return tg.df
+    return measure(build, repeat, number)
+
+def bench_plot(factors, levels, repeat, number):
+    tg = make(factors, levels)
+    tg.run()
+
+    def render():
+        tg.save_plot(io.BytesIO(), format="png")
+    return measure(render, repeat, number)
+
+def bench_sheet(factors, levels, kind, repeat, number):
+    from pyTaguchi import render
+    tg = make(factors, levels)
+    tg.run()
+    out = tempfile.mkdtemp()
+    funcs = {"text": lambda: render.to_text(tg), "html": lambda: render.to_html(tg),
+             "png": lambda: render.save_pages(tg, os.path.join(out, "sheet.png"))}
+    return measure(funcs[kind], repeat, number)
+
+def bench_batch(variants, factors, levels, repeat, number):
+    values = numpy.random.default_rng(0).random((variants, factors, levels))
+    batch = TaguchiBatch(values)
+    return measure(lambda: batch.run(randomize=True, seed=0), repeat, number)
+
+def bench_import(repeat):
+    samples = sorted(import_time() for _ in range(repeat))
+    return {"best": samples[0], "median": samples[len(samples) // 2], "repeat": repeat, "number": 1}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions")
+    args = parser.parse_args(argv)
+    repeat = 3 if args.quick else 7
+    number = 20 if args.quick else 200
+
+    check_design()
+    check_import()
+    results = {}
+    for name, factors, levels in BUILTIN:
+        results["design." + name] = bench_design(factors, levels, repeat, number)
+        results["df." + name] = bench_df(factors, levels, repeat, number)
+    for name, factors, levels in GENERATED:
+        arrays.assign([levels] * factors)
+        results["design." + name] = bench_design(factors, levels, repeat, max(1, number // 10))
+        results["df." + name] = bench_df(factors, levels, repeat, max(1, number // 10))
+    results["batch.L9x10000"] = bench_batch(10000, 4, 3, repeat, max(1, number // 20))
+    results["batch.L12x10000"] = bench_batch(10000, 11, 2, repeat, max(1, number // 20))
+    for name, factors, levels in [("L9", 4, 3), ("L16b", 5, 4)]:
+        results["plot." + name] = bench_plot(factors, levels, repeat, 1)
+    for kind in ("text", "html", "png"):
+        results["sheet.%s.L32" % kind] = bench_sheet(31, 2, kind, repeat, 1 if kind == "png" else number)
+    results["import.taguchi"] = bench_import(repeat)
+
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -25,4 +25,6 @@ tg.add(var1)
 tg.add(var2)
 tg.add(var3)
 tg.add(var4)
-tg.run(randomize=True)
\ No newline at end of file
+tg.run(randomize=True)
+print(tg.df)
+tg.save_plot("taguchi_table.png")
\ No newline at end of file
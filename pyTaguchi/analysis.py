@@ -0,0 +1,113 @@
+from numpy import arange, asarray, bincount, broadcast_to, errstate, inf, isnan, log10, nan, where, zeros
+
+# Analysis of measured responses for a design.
+# Responses are shaped (runs, replicates, responses) with runs in the same
+# order as Taguchi.matrix / Taguchi.table. Every statistic is computed for all
+# responses at once; grouping by factor level is a single bincount.
+# Ref. https://www.itl.nist.gov/div898/handbook/pri/section5/pri56.htm
+
+SN_TYPES = ("smaller", "larger", "nominal")
+
+def as_responses(y):
+    y = asarray(y, dtype=float)
+    if y.ndim == 1:
+        return y[:, None, None]
+    if y.ndim == 2:
+        return y[:, :, None]
+    if y.ndim == 3:
+        return y
+    raise ValueError("Responses should have shape (runs, replicates, responses)!")
+
+def sn_ratio(y, kind="nominal"):
+    # (runs, replicates, responses) -> (runs, responses)
+    y = as_responses(y)
+    with errstate(divide="ignore", invalid="ignore"):
+        if kind == "smaller":
+            return -10 * log10((y**2).mean(axis=1))
+        if kind == "larger":
+            return -10 * log10((1 / y**2).mean(axis=1))
+        if kind == "nominal":
+            if y.shape[1] < 2:
+                return zeros(y.shape[::2]) + nan
+            return 10 * log10(y.mean(axis=1)**2 / y.var(axis=1, ddof=1))
+    raise ValueError("S/N type should be one of %s" % (SN_TYPES,))
+
+def level_means(table, values):
+    # (runs, factors), (runs, responses) -> (factors, levels, responses)
+    # One bincount over (factor, level, response) keys: each run only adds
+    # to its own cells, so a non-finite value does not spill into other levels
+    runs, factors = table.shape
+    responses = values.shape[1]
+    n_levels = int(table.max()) + 1
+    cells = arange(factors) * n_levels + table
+    keys = cells[:, :, None] * responses + arange(responses)
+    size = factors * n_levels * responses
+    sums = bincount(keys.ravel(), broadcast_to(values[:, None, :], keys.shape).ravel(), size)
+    counts = bincount(cells.ravel(), minlength=factors * n_levels).reshape(factors, n_levels)
+    with errstate(divide="ignore", invalid="ignore"):
+        means = sums.reshape(factors, n_levels, responses) / counts[:, :, None]
+    return means, counts
+
+def anova(table, y):
+    # Main-effects ANOVA over all replicates; the error term pools replicate
+    # scatter and any unassigned columns
+    y = as_responses(y)
+    runs, reps, _ = y.shape
+    run_means = y.mean(axis=1)
+    grand = run_means.mean(axis=0)
+    means, counts = level_means(table, run_means)
+    dev = where(counts[:, :, None] > 0, means - grand, 0)
+    ss = (counts[:, :, None] * reps * dev**2).sum(axis=1)
+    dof = (counts > 0).sum(axis=1) - 1
+    ss_total = ((y - grand)**2).sum(axis=(0, 1))
+    ss_error = ss_total - ss.sum(axis=0)
+    dof_error = runs * reps - 1 - dof.sum()
+    with errstate(divide="ignore", invalid="ignore"):
+        ms = ss / dof[:, None]
+        ms_error = ss_error / dof_error if dof_error > 0 else ss_error * nan
+        f_ratio = ms / ms_error
+        contribution = 100 * ss / ss_total
+    return {
+        "ss": ss,
+        "dof": dof,
+        "ms": ms,
+        "f": f_ratio,
+        "contribution": contribution,
+        "ss_error": ss_error,
+        "dof_error": dof_error,
+        "ss_total": ss_total,
+    }
+
+def level_range(means):
+    # (factors, levels, responses) -> max - min over the levels that have a
+    # value; NaN where none has (e.g. nominal S/N with a single replicate)
+    observed = ~isnan(means)
+    with errstate(invalid="ignore"):
+        high = where(observed, means, -inf).max(axis=1)
+        low = where(observed, means, inf).min(axis=1)
+        return where(observed.any(axis=1), high - low, nan)
+
+class Analysis():
+    def __init__(self, table, responses, kind="nominal"):
+        self.table = asarray(table)
+        self.responses = as_responses(responses)
+        if self.responses.shape[0] != self.table.shape[0]:
+            raise ValueError("One response row per run is required!")
+        self.kind = kind
+        self.sn = sn_ratio(self.responses, kind)
+        self.means, self.counts = level_means(self.table, self.responses.mean(axis=1))
+        self.sn_means, _ = level_means(self.table, self.sn)
+        # Range of the level means (delta) ranks the factors
+        # (levels a factor does not have are NaN in mixed-level designs)
+        self.effects = level_range(self.means)
+        self.sn_effects = level_range(self.sn_means)
+        self.anova = anova(self.table, self.responses)
+        self.contribution = self.anova["contribution"]
+
+    def best_levels(self):
+        # Level with the highest mean S/N ratio, per factor and response
+        return where(isnan(self.sn_means), -inf, self.sn_means).argmax(axis=1)
+
+    def predictor(self, response=0, target="mean", maximize=True):
+        from pyTaguchi.prediction import Predictor
+        return Predictor(self, response, target, maximize)
@@ -0,0 +1,260 @@
+from threading import RLock
+
+from numpy import array, asarray, concatenate, repeat, uint8
+
+from pyTaguchi import generator, verify
+from pyTaguchi.verify import column_levels, is_orthogonal
+
+# Registry of orthogonal arrays stored as zero-based level indices.
+# A design is built by looking up each variable's values with its column.
+# Columns may have different numbers of levels (mixed-level arrays).
+ARRAYS = {}
+LEVELS = {}
+# Names registered through add(); only these may be replaced
+USER = set()
+# Generated arrays may be registered while other threads are assigning
+_lock = RLock()
+
+def register(name, table):
+    table = array(table, dtype=uint8)
+    table.setflags(write=False)
+    with _lock:
+        LEVELS[name] = column_levels(table)
+        ARRAYS[name] = table
+    return table
+
+def registered():
+    # Snapshot of (name, table, column levels), in registration order
+    with _lock:
+        return [(name, table, LEVELS[name]) for name, table in ARRAYS.items()]
+
+def get(name):
+    try:
+        return ARRAYS[name]
+    except KeyError:
+        raise Exception("Taguchi design not available.") from None
+
+def add(name, table, replace=False):
+    # User-supplied arrays enter the registry only once they are verified.
+    # Built-in and generated arrays are never replaced; an array added
+    # earlier only with replace=True, which also drops cached designs.
+    table = verify.as_table(table)
+    if table.max() > 255:
+        raise ValueError("Array should have at most 256 levels per column.")
+    if not verify.is_orthogonal(table):
+        raise ValueError("Array %s is not orthogonal (strength 2)." % name)
+    with _lock:
+        if name in ARRAYS and not (replace and name in USER):
+            raise ValueError("Array %s is already registered." % name)
+        replaced = name in ARRAYS
+        table = register(name, table)
+        USER.add(name)
+    if replaced:
+        from pyTaguchi.design import cache_clear
+        cache_clear()
+    return table
+
+def fit(col_levels, levels):
+    # Gives every factor its own column with at least as many levels
+    # (extra levels become dummy levels). Factors are placed largest first on
+    # the smallest sufficient column, which succeeds whenever any assignment
+    # exists, so no permutation search is needed. Returns (columns, dummy
+    # level count) or (None, None).
+    free = {}
+    for c in range(len(col_levels) - 1, -1, -1):
+        free.setdefault(int(col_levels[c]), []).append(c)
+    sizes = sorted(free)
+    columns = [None] * len(levels)
+    dummy = 0
+    for i in sorted(range(len(levels)), key=lambda i: -levels[i]):
+        for size in sizes:
+            if size >= levels[i] and free[size]:
+                columns[i] = free[size].pop()
+                dummy += size - levels[i]
+                break
+        else:
+            return None, None
+    return columns, dummy
+
+def _candidates(levels):
+    # Arrays built on demand: (runs, name, factory)
+    top = max(max(levels), 2)
+    q = top
+    while generator.prime_power(q) is None:
+        q += 1
+    runs = generator.runs_for(len(levels), q)
+    if runs is not None:
+        yield runs, None, lambda: generator.generate(len(levels), q)
+    if 2 < top <= 4:
+        m = sum(1 for l in levels if l > 2)
+        k = len(levels) - m
+        n = 2
+        while (1 << n) - 1 - 3 * m < k:
+            n += 1
+        while n <= 12 and generator.disjoint_lines(n, m) is None:
+            n += 1
+        if n <= 12:
+            yield 1 << n, None, lambda: generator.merged(n, m)
+
+def _name(table):
+    col_levels = column_levels(table)
+    parts = []
+    for size in sorted(set(col_levels.tolist()), reverse=True):
+        parts.append("%d^%d" % (size, (col_levels == size).sum()))
+    return "L%d(%s)" % (table.shape[0], " ".join(parts))
+
+def assign(levels):
+    # Smallest array that fits factors with the given numbers of levels.
+    # Registered arrays win ties; generated ones are verified and registered.
+    levels = [int(l) for l in levels]
+    if not levels or min(levels) < 1:
+        raise Exception("Taguchi design not available.")
+    best = None
+    arrays = registered()
+    for rank, (name, table, col_levels) in enumerate(arrays):
+        columns, dummy = fit(col_levels, levels)
+        if columns is not None:
+            key = (table.shape[0], dummy, rank)
+            if best is None or key < best[0]:
+                best = (key, name, columns)
+    for runs, _, factory in _candidates(levels):
+        if best is not None and runs >= best[0][0]:
+            continue
+        table = factory()
+        if not is_orthogonal(table):
+            raise Exception("Generated array is not orthogonal.")
+        name = _name(table)
+        table = register(name, table)
+        columns, dummy = fit(column_levels(table), levels)
+        key = (runs, dummy, len(arrays))
+        if best is None or key < best[0]:
+            best = (key, name, columns)
+    if best is None:
+        raise Exception("Taguchi design not available.")
+    return best[1], best[2]
+
+def design_table(levels):
+    # (array name, level-index table with one column per factor)
+    name, columns = assign(levels)
+    table = get(name)[:, columns]
+    if (LEVELS[name][columns] > asarray(levels)).any():
+        # Dummy levels: surplus column levels repeat the factor's first levels
+        table = table % asarray(levels, dtype=uint8)
+    return name, table
+
+# L4: https://www.itl.nist.gov/div898/software/dataplot/dex/L4.DAT
+register("L4", [
+    [0, 0, 0],
+    [0, 1, 1],
+    [1, 0, 1],
+    [1, 1, 0],
+])
+
+# L9: https://www.itl.nist.gov/div898/software/dataplot/dex/L9.DAT
+register("L9", [
+    [0, 0, 0, 0],
+    [0, 1, 1, 1],
+    [0, 2, 2, 2],
+    [1, 0, 1, 2],
+    [1, 1, 2, 0],
+    [1, 2, 0, 1],
+    [2, 0, 2, 1],
+    [2, 1, 0, 2],
+    [2, 2, 1, 0],
+])
+
+# L16b (1): https://www.york.ac.uk/depts/maths/tables/l16b.htm
+# L16b (2): https://www.itl.nist.gov/div898/software/dataplot/dex/L16B.DAT
+register("L16b", [
+    [0, 0, 0, 0, 0],
+    [0, 1, 1, 1, 1],
+    [0, 2, 2, 2, 2],
+    [0, 3, 3, 3, 3],
+    [1, 0, 1, 2, 3],
+    [1, 1, 0, 3, 2],
+    [1, 2, 3, 0, 1],
+    [1, 3, 2, 1, 0],
+    [2, 0, 2, 3, 1],
+    [2, 1, 3, 2, 0],
+    [2, 2, 0, 1, 3],
+    [2, 3, 1, 0, 2],
+    [3, 0, 3, 1, 2],
+    [3, 1, 2, 0, 3],
+    [3, 2, 1, 3, 0],
+    [3, 3, 0, 2, 1],
+])
+
+# L8: https://www.itl.nist.gov/div898/software/dataplot/dex/L8.DAT
+register("L8", [
+    [0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 1, 1, 1, 1],
+    [0, 1, 1, 0, 0, 1, 1],
+    [0, 1, 1, 1, 1, 0, 0],
+    [1, 0, 1, 0, 1, 0, 1],
+    [1, 0, 1, 1, 0, 1, 0],
+    [1, 1, 0, 0, 1, 1, 0],
+    [1, 1, 0, 1, 0, 0, 1],
+])
+
+# L12: https://www.york.ac.uk/depts/maths/tables/l12.gif
+register("L12", [
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1],
+    [0, 0, 1, 1, 1, 0, 0, 0, 1, 1, 1],
+    [0, 1, 0, 1, 1, 0, 1, 1, 0, 0, 1],
+    [0, 1, 1, 0, 1, 1, 0, 1, 0, 1, 0],
+    [0, 1, 1, 1, 0, 1, 1, 0, 1, 0, 0],
+    [1, 0, 1, 1, 0, 0, 1, 1, 0, 1, 0],
+    [1, 0, 1, 0, 1, 1, 1, 0, 0, 0, 1],
+    [1, 0, 0, 1, 1, 1, 0, 1, 1, 0, 0],
+    [1, 1, 1, 0, 0, 0, 0, 1, 1, 0, 1],
+    [1, 1, 0, 1, 0, 1, 0, 0, 0, 1, 1],
+    [1, 1, 0, 0, 1, 0, 1, 0, 1, 1, 0],
+])
+
+# L18 (2^1 3^7): https://www.york.ac.uk/depts/maths/tables/l18.gif
+register("L18", [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 1, 1, 1, 1, 1, 1],
+    [0, 0, 2, 2, 2, 2, 2, 2],
+    [0, 1, 0, 0, 1, 1, 2, 2],
+    [0, 1, 1, 1, 2, 2, 0, 0],
+    [0, 1, 2, 2, 0, 0, 1, 1],
+    [0, 2, 0, 1, 0, 2, 1, 2],
+    [0, 2, 1, 2, 1, 0, 2, 0],
+    [0, 2, 2, 0, 2, 1, 0, 1],
+    [1, 0, 0, 2, 2, 1, 1, 0],
+    [1, 0, 1, 0, 0, 2, 2, 1],
+    [1, 0, 2, 1, 1, 0, 0, 2],
+    [1, 1, 0, 1, 2, 0, 2, 1],
+    [1, 1, 1, 2, 0, 1, 0, 2],
+    [1, 1, 2, 0, 1, 2, 1, 0],
+    [1, 2, 0, 2, 1, 2, 0, 1],
+    [1, 2, 1, 0, 2, 0, 1, 2],
+    [1, 2, 2, 1, 0, 1, 2, 0],
+])
+
+# L27 (3^13): Rao-Hamming array over GF(3)
+register("L27", generator.rao_hamming(3, 3))
+
+# L32b (2^1 4^9): 2-level L32 with nine merged column triples
+register("L32b", generator.merged(5, 9)[:, [9, 0, 1, 2, 3, 4, 5, 6, 7, 8]])
+
+# L36 (2^11 3^12): L12 on the blocks of a difference scheme D(12, 12, 3)
+# expanded over GF(3); each 3-level column sees every level once per block
+DIFFERENCE_SCHEME_12_12_3 = [
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2],
+    [0, 0, 0, 1, 0, 2, 2, 2, 1, 1, 1, 2],
+    [0, 0, 1, 2, 2, 0, 1, 2, 0, 1, 2, 1],
+    [0, 1, 0, 2, 2, 1, 2, 0, 2, 0, 1, 1],
+    [0, 1, 2, 0, 1, 2, 0, 2, 0, 2, 1, 1],
+    [0, 1, 2, 1, 2, 0, 0, 1, 2, 1, 0, 2],
+    [0, 1, 2, 2, 0, 2, 1, 1, 1, 0, 2, 0],
+    [0, 2, 1, 0, 2, 0, 2, 1, 1, 2, 1, 0],
+    [0, 2, 1, 1, 0, 2, 1, 0, 2, 2, 0, 1],
+    [0, 2, 1, 2, 1, 1, 0, 2, 1, 0, 0, 2],
+    [0, 2, 2, 1, 1, 1, 2, 0, 0, 1, 2, 0],
+]
+register("L36", concatenate([repeat(ARRAYS["L12"], 3, axis=0),
+                             generator.expand(DIFFERENCE_SCHEME_12_12_3, 3)], axis=1))
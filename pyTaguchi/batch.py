@@ -0,0 +1,62 @@
+from numpy import arange, asarray, repeat, take_along_axis, tile
+
+from pyTaguchi import arrays
+from pyTaguchi.randomization import permutations
+
+# Many variable sets sharing one (factors, levels) shape, built against the
+# same orthogonal array with a single broadcasted gather.
+class TaguchiBatch():
+    def __init__(self, values, names=None):
+        # values: (variants, factors, levels) array of level values
+        self.values = asarray(values)
+        if self.values.ndim != 3:
+            raise ValueError("Values should have shape (variants, factors, levels)!")
+        self.VARIANTS, self.FACTORS, self.LEVELS = self.values.shape
+        if names is None:
+            names = ["Variable n.%d" % (i + 1) for i in range(self.FACTORS)]
+        self.columns = [str(name) for name in names]
+        if len(self.columns) != self.FACTORS:
+            raise ValueError("One name per factor is required!")
+
+    def run(self, randomize=False, seed=None, blocks=None):
+        self.generate_design()
+        if randomize == True:
+            self.randomize_runs(seed, blocks)
+
+    def generate_design(self):
+        self.design, self.table = arrays.design_table([self.LEVELS] * self.FACTORS)
+        self.OBSERVATIONS = self.table.shape[0]
+        # (variants, runs, factors) in one gather
+        self.matrix = self.values[:, arange(self.FACTORS), self.table]
+        self.order = tile(arange(self.OBSERVATIONS), (self.VARIANTS, 1))
+
+    def randomize_runs(self, seed=None, blocks=None):
+        # Independent permutation per variant from one call
+        perm = permutations(self.OBSERVATIONS, self.VARIANTS, seed, blocks)
+        self.matrix = take_along_axis(self.matrix, perm[:, :, None], axis=1)
+        self.order = take_along_axis(self.order, perm, axis=1)
+
+    def to_frame(self):
+        # Long format: one row per (variant, run)
+        import pandas as pd
+        from pyTaguchi.export import run_labels
+        rows = run_labels(self.OBSERVATIONS)
+        index = pd.MultiIndex.from_product([range(self.VARIANTS), rows], names=["variant", "run"])
+        df = pd.DataFrame(self.matrix.reshape(-1, self.FACTORS), columns=self.columns, index=index)
+        df.insert(0, "original run", self.order.reshape(-1) + 1)
+        return df
+
+    def to_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for Arrow output.") from None
+        flat = self.matrix.reshape(-1, self.FACTORS)
+        data = {
+            "variant": repeat(arange(self.VARIANTS), self.OBSERVATIONS),
+            "run": tile(arange(1, self.OBSERVATIONS + 1), self.VARIANTS),
+            "original run": self.order.reshape(-1) + 1,
+        }
+        for i, name in enumerate(self.columns):
+            data[name] = flat[:, i]
+        return pa.table(data)
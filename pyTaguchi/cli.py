@@ -0,0 +1,154 @@
+"""pytaguchi: generate Taguchi designs from study spec files.
+
+A spec is a JSON (or YAML, with PyYAML installed) object:
+
+    {"name": "study-1",
+     "variables": [{"name": "Temperature", "values": [30, 35, 40]}, ...],
+     "randomize": true, "seed": 42, "blocks": null,
+     "format": "csv", "levels": false}
+
+A file may hold one spec, a list of specs or one JSON spec per line. Names
+are used as file names in the output directory and may not contain paths.
+
+    pytaguchi generate specs/*.json -o out/ --workers 8
+    cat specs.jsonl | pytaguchi generate - -o out/
+    pytaguchi worker -o out/      # reads spec paths or JSON specs from stdin
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_FORMAT = "csv"
+
+def load_specs(path):
+    if path == "-":
+        return parse_specs(sys.stdin.read(), "-")
+    with open(path) as fh:
+        return parse_specs(fh.read(), path)
+
+def _stem(source):
+    # Default name prefix for specs without a "name"
+    if source in ("", "-", "stdin"):
+        return "stdin"
+    return os.path.splitext(os.path.basename(source))[0] or "study"
+
+def parse_specs(text, source="", start=0):
+    # start: number of the first unnamed spec, so a long-running reader can
+    # keep default names unique across inputs
+    if source.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("PyYAML is required for YAML specs.") from None
+        data = yaml.safe_load(text)
+    else:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    specs = data if isinstance(data, list) else [data]
+    for i, spec in enumerate(specs):
+        if "variables" not in spec:
+            raise ValueError("Spec %d in %s has no variables." % (i, source))
+        spec.setdefault("name", "%s-%d" % (_stem(source), start + i))
+    return specs
+
+def _filename(name):
+    # Spec names become file names inside the output directory: no paths
+    name = str(name)
+    if name in ("", ".", "..") or any(c in name for c in "/\\\0"):
+        raise ValueError("Spec name %r should be a plain file name." % name)
+    return name
+
+def generate(spec, outdir):
+    # Module level so worker processes can run it
+    from pyTaguchi.taguchi import Taguchi
+    path = os.path.join(outdir, "%s.%s" % (_filename(spec["name"]), spec.get("format", DEFAULT_FORMAT)))
+    tg = Taguchi()
+    for variable in spec["variables"]:
+        tg.add(variable)
+    tg.run(randomize=spec.get("randomize", False), seed=spec.get("seed"), blocks=spec.get("blocks"))
+    tg.export(path, levels=spec.get("levels", False))
+    return {"name": spec["name"], "design": tg.design, "runs": tg.OBSERVATIONS, "path": path}
+
+def _safe_generate(spec, outdir):
+    try:
+        return generate(spec, outdir)
+    except Exception as e:
+        return {"name": spec.get("name"), "error": repr(e)}
+
+def _report(result):
+    print(json.dumps(result), flush=True)
+    return "error" not in result
+
+def run_generate(args):
+    specs = [spec for path in args.specs for spec in load_specs(path)]
+    os.makedirs(args.output, exist_ok=True)
+    ok = True
+    if args.workers == 1 or len(specs) == 1:
+        for spec in specs:
+            ok &= _report(_safe_generate(spec, args.output))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            chunksize = max(1, len(specs) // (4 * (args.workers or os.cpu_count() or 1)))
+            for result in pool.map(_safe_generate, specs, [args.output] * len(specs), chunksize=chunksize):
+                ok &= _report(result)
+    return 0 if ok else 1
+
+def run_worker(args):
+    # Stays up with a warm process pool; each stdin line is a spec path or a
+    # JSON spec, and each study is reported as one JSON line as soon as it
+    # finishes, even while the worker waits for more input
+    os.makedirs(args.output, exist_ok=True)
+    lock = threading.Lock()
+
+    def done(future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {"name": future.spec.get("name"), "error": repr(e)}
+        with lock:
+            _report(result)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = 0
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                if line.startswith(("{", "[")):
+                    # Inline specs are numbered by job: stdin-0, stdin-1, ...
+                    specs = parse_specs(line, "stdin", jobs)
+                    jobs += len(specs)
+                else:
+                    specs = load_specs(line)
+            except Exception as e:
+                with lock:
+                    _report({"input": line, "error": repr(e)})
+                continue
+            for spec in specs:
+                future = pool.submit(_safe_generate, spec, args.output)
+                future.spec = spec
+                future.add_done_callback(done)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="pytaguchi", description="Generate Taguchi designs from study specs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="generate designs for spec files ('-' for stdin)")
+    gen.add_argument("specs", nargs="+")
+    worker = sub.add_parser("worker", help="long-running worker reading specs from stdin")
+    for p in (gen, worker):
+        p.add_argument("-o", "--output", default=".", help="export directory")
+        p.add_argument("-w", "--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        return run_generate(args)
+    return run_worker(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
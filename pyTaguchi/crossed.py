@@ -0,0 +1,51 @@
+import csv
+
+from numpy import arange, column_stack
+
+from pyTaguchi.export import level_strings
+
+# Crossed robust-parameter design: every run of the inner (control) array is
+# repeated for every run of the outer (noise) array. The product is never
+# built; runs are produced in chunks from the two small designs.
+
+class CrossedDesign():
+    def __init__(self, inner, outer):
+        # inner, outer: Taguchi objects after run(), or Design results
+        self.inner = getattr(inner, "result", inner)
+        self.outer = getattr(outer, "result", outer)
+        self.columns = self.inner.columns + self.outer.columns
+        self.runs = self.inner.runs * self.outer.runs
+
+    def __len__(self):
+        return self.runs
+
+    def chunks(self, size=65536, start=0, stop=None):
+        # Yields (inner runs, outer runs, control values, noise values) for
+        # consecutive crossed runs; memory is bounded by the chunk size.
+        # Run numbers are the original run indices of each array.
+        stop = self.runs if stop is None else min(stop, self.runs)
+        for first in range(start, stop, size):
+            index = arange(first, min(first + size, stop))
+            i, j = divmod(index, self.outer.runs)
+            yield (self.inner.order[i], self.outer.order[j],
+                   self.inner.take(i), self.outer.take(j))
+
+    def __iter__(self):
+        for inner_runs, outer_runs, control, noise in self.chunks():
+            yield from zip(inner_runs.tolist(), outer_runs.tolist(),
+                           control.tolist(), noise.tolist())
+
+    def to_csv(self, path, size=65536):
+        # Streams the full product to CSV, one chunk at a time. Every level
+        # is formatted once from its lookup, so integer factors stay integers
+        # and run numbers are not promoted to float.
+        texts = level_strings(self.inner.lookups + self.outer.lookups)
+        with open(path, "w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["inner run", "outer run"] + list(self.columns))
+            for first in range(0, self.runs, size):
+                i, j = divmod(arange(first, min(first + size, self.runs)), self.outer.runs)
+                levels = column_stack([self.inner.table[i], self.outer.table[j]])
+                columns = [(self.inner.order[i] + 1).tolist(), (self.outer.order[j] + 1).tolist()]
+                columns += [text[levels[:, c]].tolist() for c, text in enumerate(texts)]
+                writer.writerows(zip(*columns))
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+from numpy import column_stack, empty
+
+# Immutable result of Taguchi.run. All arrays are read-only, so one Design can
+# be shared between threads and handed out from the cache below.
+
+CACHE_SIZE = 256
+
+def _readonly(a):
+    a.setflags(write=False)
+    return a
+
+@dataclass(frozen=True, eq=False)
+class Design():
+    name: str
+    columns: tuple
+    lookups: tuple
+    table: object
+    order: object
+
+    @classmethod
+    def from_taguchi(cls, tg):
+        # Taguchi only ever replaces its arrays, so they can be frozen in place
+        return cls(tg.design,
+                   tuple(variable.name for variable in tg.variables),
+                   tuple(_readonly(variable.lookup.copy()) for variable in tg.variables),
+                   _readonly(tg.table),
+                   _readonly(tg.order))
+
+    @property
+    def runs(self):
+        return self.table.shape[0]
+
+    @cached_property
+    def matrix(self):
+        return _readonly(self.take(slice(None)))
+
+    def take(self, rows):
+        # Values of the selected runs: float if every factor is numeric
+        table = self.table[rows]
+        columns = [lookup[table[:, i]] for i, lookup in enumerate(self.lookups)]
+        if all(lookup.dtype.kind in "biuf" for lookup in self.lookups):
+            return column_stack(columns).astype(float)
+        matrix = empty(table.shape, dtype=object)
+        for i, column in enumerate(columns):
+            matrix[:, i] = column
+        return matrix
+
+    def to_frame(self):
+        # A new DataFrame per call; the shared arrays stay untouched
+        import pandas as pd
+        from pyTaguchi.export import run_labels
+        data = {i: lookup[self.table[:, i]] for i, lookup in enumerate(self.lookups)}
+        df = pd.DataFrame(data, index=run_labels(self.runs))
+        df.columns = list(self.columns)
+        return df
+
+def _key(variables):
+    return tuple((str(v["name"]), tuple(v["values"])) for v in variables)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached(key, randomize, seed, blocks):
+    from pyTaguchi.taguchi import Taguchi
+    tg = Taguchi()
+    for name, values in key:
+        tg.add({"name": name, "values": list(values)})
+    design = tg.run(randomize=randomize, seed=seed, blocks=blocks)
+    design.matrix
+    return design
+
+def cached_design(variables, randomize=False, seed=None, blocks=None):
+    # variables: list of {"name", "values"} dicts as passed to Taguchi.add.
+    # Repeated requests return the same shared Design; randomized designs
+    # are only cached with an int seed.
+    if isinstance(blocks, list):
+        blocks = tuple(blocks)
+    if randomize and not isinstance(seed, int):
+        return _cached.__wrapped__(_key(variables), randomize, seed, blocks)
+    return _cached(_key(variables), randomize, seed if randomize else None, blocks)
+
+def cache_info():
+    return _cached.cache_info()
+
+def cache_clear():
+    _cached.cache_clear()
@@ -0,0 +1,115 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from numpy import array, zeros
+
+# Evaluates an objective function for every run (and replicate) of a design.
+# The function receives one dict {variable name: value} per call.
+
+BACKENDS = ("serial", "thread", "process", "async")
+
+def _call(func, settings, retries):
+    # Module level so it can be pickled for the process backend
+    attempts = 0
+    start = time.perf_counter()
+    while True:
+        attempts += 1
+        try:
+            value = func(settings)
+            return value, time.perf_counter() - start, attempts, None
+        except Exception as e:
+            if attempts > retries:
+                return None, time.perf_counter() - start, attempts, repr(e)
+
+async def _acall(func, settings, retries, semaphore):
+    async with semaphore:
+        attempts = 0
+        start = time.perf_counter()
+        while True:
+            attempts += 1
+            try:
+                value = await func(settings)
+                return value, time.perf_counter() - start, attempts, None
+            except Exception as e:
+                if attempts > retries:
+                    return None, time.perf_counter() - start, attempts, repr(e)
+
+async def _gather(func, jobs, retries, max_workers, record):
+    semaphore = asyncio.Semaphore(max_workers or len(jobs) or 1)
+
+    async def run(key, settings):
+        record(key, await _acall(func, settings, retries, semaphore))
+
+    await asyncio.gather(*[run(key, settings) for key, settings in jobs])
+
+class ExecutionResult():
+    def __init__(self, labels, columns, outcomes, replicates):
+        runs = len(labels)
+        self.labels = labels
+        self.columns = columns
+        self.values = [[None] * replicates for _ in range(runs)]
+        self.times = zeros((runs, replicates))
+        self.attempts = zeros((runs, replicates), dtype=int)
+        self.errors = {}
+        for k, (value, elapsed, attempts, error) in enumerate(outcomes):
+            i, r = divmod(k, replicates)
+            self.values[i][r] = value
+            self.times[i, r] = elapsed
+            self.attempts[i, r] = attempts
+            if error is not None:
+                self.errors[(labels[i], r)] = error
+
+    def responses(self):
+        # (runs, replicates[, responses]) array for Taguchi.analyze
+        if self.errors:
+            raise ValueError("Some runs failed: %s" % sorted(self.errors))
+        return array(self.values, dtype=float)
+
+    def to_frame(self):
+        import pandas as pd
+        rows = []
+        for i, label in enumerate(self.labels):
+            for r, value in enumerate(self.values[i]):
+                rows.append((label, r, value, self.times[i, r], self.attempts[i, r],
+                             self.errors.get((label, r))))
+        df = pd.DataFrame(rows, columns=["run", "replicate", "result", "time", "attempts", "error"])
+        return df.set_index(["run", "replicate"])
+
+def execute(labels, columns, matrix, func, backend="thread", max_workers=None,
+            retries=0, replicates=1, runs=None, store=None, design=None):
+    # runs: original run index of each matrix row, used as the store key
+    if backend not in BACKENDS:
+        raise ValueError("Backend should be one of %s" % (BACKENDS,))
+    if runs is None:
+        runs = range(len(matrix))
+    keys = [(int(run), r) for run in runs for r in range(replicates)]
+    outcomes = {}
+    if store is not None:
+        for key, (value, elapsed, attempts) in store.load(design).items():
+            outcomes[key] = (value, elapsed, attempts, None)
+    jobs = [((int(run), r), dict(zip(columns, row.tolist())))
+            for run, row in zip(runs, matrix) for r in range(replicates)
+            if (int(run), r) not in outcomes]
+
+    def record(key, outcome):
+        # Flushed as soon as each run finishes; failures are retried next time
+        outcomes[key] = outcome
+        if store is not None and outcome[3] is None:
+            store.put(design, key[0], key[1], outcome[0], outcome[1], outcome[2])
+
+    if inspect.iscoroutinefunction(func):
+        backend = "async"
+    if backend == "async":
+        asyncio.run(_gather(func, jobs, retries, max_workers, record))
+    elif backend == "serial":
+        for key, settings in jobs:
+            record(key, _call(func, settings, retries))
+    else:
+        pool = ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+        with pool(max_workers=max_workers) as ex:
+            futures = {ex.submit(_call, func, settings, retries): key for key, settings in jobs}
+            for future in as_completed(futures):
+                record(futures[future], future.result())
+    return ExecutionResult(labels, columns, [outcomes[key] for key in keys], replicates)
@@ -0,0 +1,252 @@
+import csv
+import os
+
+from numpy import arange, asarray, char, dtype, empty, frombuffer, int32, lib, load, savetxt, tile, zeros
+
+# Writes designs straight from their arrays: no DataFrame in between.
+# Every format takes one or more sources (a Taguchi after run(), a Design or
+# a TaguchiBatch) and appends them to the same file; rows carry the design
+# number, the run label position and the original run index.
+#
+#   .csv      text, values (or level indices with levels=True)
+#   .npy      structured array, memory-mappable with open_memmap()
+#   .parquet  Parquet row groups (pyarrow)
+#   .arrow    Arrow IPC stream (pyarrow)
+
+FORMATS = ("csv", "npy", "parquet", "arrow")
+
+def run_labels(runs, start=0):
+    # "RUN 1", "RUN 2", ... without a Python loop
+    return char.add("RUN ", arange(start + 1, start + runs + 1).astype(str))
+
+def level_strings(lookups):
+    # Text of every level, formatted once per column from its own values, so
+    # integer factors stay integers and floats use their shortest repr
+    return [asarray([str(value) for value in lookup.tolist()]) for lookup in lookups]
+
+def blocks(source, levels=False):
+    # -> iterator of (columns, design numbers, run positions, original runs,
+    #                 data, cells) with one row per exported run; cells is
+    #                 (level table, lookups) when the values come from lookups
+    if hasattr(source, "VARIANTS"):
+        variants, runs = source.VARIANTS, source.OBSERVATIONS
+        data = source.table[source.order] if levels else source.matrix
+        yield (source.columns, arange(variants).repeat(runs), tile(arange(runs), variants),
+               source.order.ravel(), data.reshape(variants * runs, -1), None)
+        return
+    design = getattr(source, "result", source)
+    data = design.table if levels else design.matrix
+    cells = None if levels else (design.table, design.lookups)
+    yield (list(design.columns), zeros(design.runs, dtype=int), arange(design.runs), design.order,
+           data, cells)
+
+def _iter(sources, levels, offset=0):
+    # offset: first design number, past the designs already in the file
+    if not isinstance(sources, (list, tuple)):
+        sources = [sources]
+    for source in sources:
+        for columns, ids, positions, original, data, cells in blocks(source, levels):
+            yield columns, ids + offset, positions, original, data, cells
+            offset += int(ids.max()) + 1 if len(ids) else 0
+
+def export(sources, path, format=None, levels=False, append=False):
+    # Format from the file extension unless given
+    if format is None:
+        format = os.path.splitext(str(path))[1].lstrip(".").lower()
+    if format not in FORMATS:
+        raise ValueError("Format should be one of %s" % (FORMATS,))
+    writer = {"csv": CSVWriter, "npy": NpyWriter,
+              "parquet": ParquetWriter, "arrow": ArrowWriter}[format](path, append=append)
+    with writer:
+        for block in _iter(sources, levels, writer.designs):
+            writer.write(*block)
+    return path
+
+def _discard(path, written, exc_type):
+    # A file this writer created is removed again when nothing was written
+    # to it or the export failed, so no empty or partial file is left behind
+    if not written or exc_type is not None:
+        os.remove(path)
+
+def _last_line(path, block=4096):
+    # Last non-empty line of a text file, read from the end
+    with open(path, "rb") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        tail = b""
+        while end > 0 and tail.strip().count(b"\n") < 1:
+            start = max(0, end - block)
+            fh.seek(start)
+            tail = fh.read(end - start) + tail
+            end = start
+    lines = tail.strip().splitlines()
+    return lines[-1].decode() if lines else ""
+
+class CSVWriter():
+    def __init__(self, path, append=False):
+        self.path = path
+        self.append = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.columns = None
+        self.designs = 0
+        if self.append:
+            with open(path, newline="") as fh:
+                self.columns = next(csv.reader(fh))[3:]
+            last = _last_line(path)
+            if last and not last.startswith("design,"):
+                self.designs = int(last.split(",", 1)[0]) + 1
+        self.fh = open(path, "a" if self.append else "w", newline="")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.fh.close()
+        if not self.append:
+            _discard(self.path, self.columns is not None, exc_type)
+
+    def write(self, columns, ids, positions, original, data, cells=None):
+        if self.columns is None:
+            self.columns = [str(name) for name in columns]
+            csv.writer(self.fh).writerow(["design", "run", "original run"] + self.columns)
+        elif [str(name) for name in columns] != self.columns:
+            raise ValueError("All designs in one file need the same columns.")
+        labels = run_labels(int(positions.max()) + 1 if len(positions) else 0)[positions]
+        if cells is not None:
+            # Design values: each column gathered from its level strings
+            table, lookups = cells
+            rows = [ids.tolist(), labels.tolist(), (original + 1).tolist()]
+            rows += [text[table[:, i]].tolist() for i, text in enumerate(level_strings(lookups))]
+            csv.writer(self.fh).writerows(zip(*rows))
+        elif data.dtype.kind in "biuf":
+            # Numeric blocks go through savetxt in one call
+            body = empty((len(ids), 3 + data.shape[1]), dtype=object)
+            body[:, 0], body[:, 1], body[:, 2] = ids, labels, original + 1
+            # Floats as their shortest round-trip repr (0.2, not 0.20000000000000001)
+            fmt = ["%d", "%s", "%d"] + ["%d" if data.dtype.kind in "biu" else "%s"] * data.shape[1]
+            body[:, 3:] = data if data.dtype.kind in "biu" else data.astype(str)
+            savetxt(self.fh, body, fmt=fmt, delimiter=",")
+        else:
+            rows = zip(ids.tolist(), labels.tolist(), (original + 1).tolist(), data.tolist())
+            csv.writer(self.fh).writerows([a, b, c] + d for a, b, c, d in rows)
+
+class NpyWriter():
+    # Appends records to an .npy file whose header is rewritten on close, so
+    # the result loads with numpy.load(path, mmap_mode="r")
+    def __init__(self, path, append=False):
+        self.path = path
+        self.dtype = None
+        self.rows = 0
+        self.designs = 0
+        self.append = append and os.path.exists(path)
+        if self.append:
+            self.fh = open(path, "r+b")
+            version = lib.format.read_magic(self.fh)
+            read = lib.format.read_array_header_1_0 if version == (1, 0) else lib.format.read_array_header_2_0
+            shape, _, self.dtype = read(self.fh)
+            self.rows = shape[0]
+            self.size = self.fh.tell()
+            if self.rows:
+                # Records are written in design order: the last one has the
+                # highest design number
+                self.fh.seek(self.size + (self.rows - 1) * self.dtype.itemsize)
+                last = frombuffer(self.fh.read(self.dtype.itemsize), dtype=self.dtype)
+                self.designs = int(last["design"][0]) + 1
+            self.fh.seek(0, os.SEEK_END)
+        else:
+            self.fh = open(path, "w+b")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if self.dtype is not None:
+            self._header(self.rows)
+        self.fh.close()
+        if not self.append:
+            _discard(self.path, self.dtype is not None, exc_type)
+
+    def _spec(self, rows):
+        spec = {"descr": lib.format.dtype_to_descr(self.dtype), "fortran_order": False,
+                "shape": (rows,)}
+        return repr(spec).encode("latin1")
+
+    def _header(self, rows):
+        # Fixed size, chosen on first write with room for any row count
+        text = self._spec(rows)
+        self.fh.seek(0)
+        self.fh.write(b"\x93NUMPY\x01\x00" + (self.size - 10).to_bytes(2, "little")
+                      + text + b" " * (self.size - 11 - len(text)) + b"\n")
+        self.fh.seek(0, os.SEEK_END)
+
+    def write(self, columns, ids, positions, original, data, cells=None):
+        if data.dtype.kind not in "biuf":
+            raise ValueError("Categorical values need levels=True for .npy output.")
+        record = dtype([("design", int32), ("run", int32), ("original run", int32)]
+                       + [(str(name), data.dtype) for name in columns])
+        if self.dtype is None:
+            self.dtype = record
+            self.size = -(-(len(self._spec(2**63)) + 11) // 64) * 64
+            self._header(0)
+        elif record != self.dtype:
+            raise ValueError("All designs in one .npy file need the same columns.")
+        out = empty(len(ids), dtype=record)
+        out["design"], out["run"], out["original run"] = ids, positions + 1, original + 1
+        for i, name in enumerate(columns):
+            out[str(name)] = data[:, i]
+        self.fh.write(out.tobytes())
+        self.rows += len(ids)
+
+def open_memmap(path):
+    # Read-only view of an exported .npy file; nothing is loaded up front
+    return load(path, mmap_mode="r")
+
+def _table(columns, ids, positions, original, data, cells=None):
+    import pyarrow as pa
+    arrays = {"design": ids, "run": positions + 1, "original run": original + 1}
+    for i, name in enumerate(columns):
+        column = data[:, i]
+        arrays[str(name)] = column.tolist() if column.dtype == object else column
+    return pa.table(arrays)
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet/Arrow output.") from None
+    return pyarrow
+
+class ParquetWriter():
+    def __init__(self, path, append=False):
+        _pyarrow()
+        if append:
+            raise ValueError("Parquet files cannot be appended to; pass all designs at once.")
+        self.path = path
+        self.writer = None
+        self.designs = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if self.writer is not None:
+            self.writer.close()
+            _discard(self.path, True, exc_type)
+
+    def write(self, *block):
+        import pyarrow.parquet as pq
+        table = _table(*block)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        elif table.schema != self.writer.schema:
+            raise ValueError("All designs in one file need the same columns.")
+        self.writer.write_table(table)
+
+class ArrowWriter(ParquetWriter):
+    def write(self, *block):
+        import pyarrow as pa
+        table = _table(*block)
+        if self.writer is None:
+            self.writer = pa.ipc.new_stream(self.path, table.schema)
+            self.schema = table.schema
+        elif table.schema != self.schema:
+            raise ValueError("All designs in one file need the same columns.")
+        self.writer.write_table(table)
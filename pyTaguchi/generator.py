@@ -0,0 +1,257 @@
+from functools import lru_cache
+from itertools import product
+
+from numpy import arange, array, block, eye, kron, ones, uint8, zeros
+
+# Orthogonal arrays built on demand.
+# Ref. Hedayat, Sloane, Stufken - Orthogonal Arrays: Theory and Applications
+#   - Rao-Hamming construction over GF(q) for prime-power levels (ch. 3.4)
+#   - Hadamard / Plackett-Burman construction for 2-level arrays (ch. 7)
+
+def prime_power(q):
+    # Returns (p, m) with q = p**m, or None
+    if q < 2:
+        return None
+    p = 2
+    while p * p <= q:
+        if q % p == 0:
+            break
+        p += 1
+    else:
+        return (q, 1)
+    m = 0
+    while q % p == 0:
+        q //= p
+        m += 1
+    return (p, m) if q == 1 else None
+
+def _irreducible(p, m):
+    # Monic polynomial of degree m over GF(p) without roots or smaller factors,
+    # coefficients lowest degree first
+    for tail in product(range(p), repeat=m):
+        poly = list(tail) + [1]
+        if poly[0] == 0:
+            continue
+        if all(_polymod(poly, list(d) + [1], p) for m2 in range(1, m // 2 + 1)
+               for d in product(range(p), repeat=m2)):
+            return poly
+    raise ValueError("No irreducible polynomial found")
+
+def _polymod(a, b, p):
+    # True if b does not divide a over GF(p)
+    a = list(a)
+    while len(a) >= len(b):
+        c = a[-1]
+        if c:
+            shift = len(a) - len(b)
+            for i, bi in enumerate(b):
+                a[shift + i] = (a[shift + i] - c * bi) % p
+        a.pop()
+    return any(a)
+
+@lru_cache(maxsize=None)
+def galois_field(q):
+    # Addition and multiplication tables of GF(q); element i encodes the
+    # polynomial whose coefficients are the base-p digits of i
+    pm = prime_power(q)
+    if pm is None:
+        raise Exception("Taguchi design not available.")
+    p, m = pm
+    if m == 1:
+        e = arange(q)
+        add = (e[:, None] + e[None, :]) % p
+        mul = (e[:, None] * e[None, :]) % p
+    else:
+        digits = array([[(i // p**k) % p for k in range(m)] for i in range(q)])
+        weights = p ** arange(m)
+        add = ((digits[:, None, :] + digits[None, :, :]) % p) @ weights
+        poly = _irreducible(p, m)
+        mul = zeros((q, q), dtype=int)
+        for i in range(q):
+            for j in range(i, q):
+                prod = [0] * (2 * m - 1)
+                for a, da in enumerate(digits[i]):
+                    if da:
+                        for b, db in enumerate(digits[j]):
+                            prod[a + b] = (prod[a + b] + da * db) % p
+                for k in range(2 * m - 2, m - 1, -1):
+                    c = prod[k]
+                    if c:
+                        for t in range(m + 1):
+                            prod[k - m + t] = (prod[k - m + t] - c * poly[t]) % p
+                mul[i, j] = mul[j, i] = int(array(prod[:m]) @ weights)
+    add.setflags(write=False)
+    mul.setflags(write=False)
+    return add, mul
+
+def rao_hamming(q, n):
+    # OA(q**n, (q**n - 1)/(q - 1), q, 2): one row per vector x of GF(q)^n,
+    # one column per normalised non-zero vector c, entry = x . c
+    add, mul = galois_field(q)
+    runs = q ** n
+    r = arange(runs)
+    x = array([(r // q ** (n - 1 - t)) % q for t in range(n)]).T
+    cols = []
+    for i in range(1, runs):
+        c = [(i // q ** t) % q for t in range(n)]
+        if [d for d in c if d][-1] == 1:
+            cols.append(c)
+    c = array(cols)
+    table = zeros((runs, len(cols)), dtype=int)
+    for t in range(n):
+        table = add[table, mul[x[:, t][:, None], c[:, t][None, :]]]
+    return table.astype(uint8)
+
+def _character(squares):
+    # Quadratic character: 0 for 0, 1 for squares, -1 otherwise
+    chi = -ones(squares.shape[0], dtype=int)
+    chi[squares] = 1
+    chi[0] = 0
+    return chi
+
+def _jacobsthal(q):
+    add, mul = galois_field(q)
+    squares = zeros(q, dtype=bool)
+    squares[mul[arange(1, q), arange(1, q)]] = True
+    chi = _character(squares)
+    neg = (add == 0).argmax(axis=1)
+    diff = add[arange(q)[:, None], neg[None, :]]
+    return chi[diff]
+
+def _paley1(q):
+    # q = 3 mod 4, order q + 1
+    Q = _jacobsthal(q)
+    j = ones((q, 1), dtype=int)
+    S = block([[zeros((1, 1), dtype=int), j.T], [-j, Q]])
+    return S + eye(q + 1, dtype=int)
+
+def _paley2(q):
+    # q = 1 mod 4, order 2(q + 1)
+    Q = _jacobsthal(q)
+    j = ones((q, 1), dtype=int)
+    C = block([[zeros((1, 1), dtype=int), j.T], [j, Q]])
+    return (kron(C, array([[1, 1], [1, -1]]))
+            + kron(eye(q + 1, dtype=int), array([[1, -1], [-1, -1]])))
+
+@lru_cache(maxsize=None)
+def _hadamard(order):
+    if order == 1:
+        return array([[1]])
+    if order == 2:
+        return array([[1, 1], [1, -1]])
+    if order % 4:
+        return None
+    pm = prime_power(order - 1)
+    if pm is not None and (order - 1) % 4 == 3:
+        return _paley1(order - 1)
+    pm = prime_power(order // 2 - 1)
+    if pm is not None and (order // 2 - 1) % 4 == 1:
+        return _paley2(order // 2 - 1)
+    half = _hadamard(order // 2)
+    if half is not None:
+        return block([[half, half], [half, -half]])
+    return None
+
+def hadamard(order):
+    H = _hadamard(order)
+    if H is None:
+        raise Exception("Taguchi design not available.")
+    return H
+
+def plackett_burman(runs):
+    # OA(runs, runs - 1, 2, 2) from a normalised Hadamard matrix
+    H = hadamard(runs)
+    H = H * H[:, :1]
+    H = H * H[:1, :]
+    return ((1 - H[:, 1:]) // 2).astype(uint8)
+
+def runs_for(factors, levels):
+    # Run count of the array generate() would build, None if unavailable
+    if prime_power(levels) is None:
+        return None
+    if levels == 2:
+        runs = 4 * (factors // 4 + 1)
+        while runs & (runs - 1) and _hadamard(runs) is None:
+            runs += 4
+        return runs
+    n = 2
+    while (levels ** n - 1) // (levels - 1) < factors:
+        n += 1
+    return levels ** n
+
+def generate(factors, levels):
+    # Smallest generated array with at least `factors` columns
+    runs = runs_for(factors, levels)
+    if runs is None:
+        raise Exception("Taguchi design not available.")
+    if levels == 2:
+        if runs & (runs - 1) == 0:
+            return rao_hamming(2, runs.bit_length() - 1)
+        return plackett_burman(runs)
+    n = 2
+    while levels ** n < runs:
+        n += 1
+    return rao_hamming(levels, n)
+
+def expand(scheme, q):
+    # Difference scheme D(r, c, q) -> OA(r*q, q^c): row i of the scheme is
+    # repeated with every field element added to it
+    add, _ = galois_field(q)
+    scheme = array(scheme)
+    return add[scheme[:, None, :], arange(q)[None, :, None]].reshape(-1, scheme.shape[1]).astype(uint8)
+
+def disjoint_lines(n, m):
+    # m pairwise disjoint lines {u, v, u^v} of PG(n-1, 2), found by a
+    # depth-first search over a bitmask of free points. Small spaces are
+    # searched exactly; larger ones use a Desarguesian spread of an
+    # even-dimensional subspace, which the greedy scan below finds directly.
+    points = 1 << n
+    # Largest partial line spread of PG(n-1, 2)
+    if m > ((points - 1) // 3 if n % 2 == 0 else (points - 5) // 3):
+        return None
+    if n > 5:
+        even = n - n % 2
+        lines, used = [], 0
+        for u in range(1, 1 << even):
+            for v in range(u + 1, 1 << even):
+                w = u ^ v
+                if not used >> u & 1 and not used >> v & 1 and not used >> w & 1:
+                    used |= 1 << u | 1 << v | 1 << w
+                    lines.append((u, v, w))
+        return lines[:m] if len(lines) >= m else None
+
+    def dfs(free, start, lines):
+        if len(lines) == m:
+            return lines
+        if bin(free).count("1") // 3 + len(lines) < m:
+            return None
+        u = start
+        while u < points and not free >> u & 1:
+            u += 1
+        if u == points:
+            return None
+        for v in range(u + 1, points):
+            w = u ^ v
+            if w > v and free >> v & 1 and free >> w & 1:
+                found = dfs(free & ~(1 << u | 1 << v | 1 << w), u + 1, lines + [(u, v, w)])
+                if found is not None:
+                    return found
+        return dfs(free & ~(1 << u), u + 1, lines)
+
+    return dfs((1 << points) - 2, 1, [])
+
+def merged(n, m):
+    # OA(2^n, 4^m 2^(2^n - 1 - 3m)) by column merging: the three 2-level
+    # columns u, v, u^v of the Rao-Hamming array become one 4-level column.
+    # Column j of rao_hamming(2, n) is the vector j + 1.
+    lines = disjoint_lines(n, m)
+    if lines is None:
+        return None
+    table = rao_hamming(2, n)
+    used = set()
+    columns = []
+    for u, v, w in lines:
+        columns.append(2 * table[:, u - 1] + table[:, v - 1])
+        used |= {u, v, w}
+    columns += [table[:, p - 1] for p in range(1, 1 << n) if p not in used]
+    return array(columns).T.astype(uint8)
@@ -0,0 +1,158 @@
+from numpy import arange, asarray, errstate, full, inf, isfinite, isnan, log10, nan, where, zeros
+
+from pyTaguchi.analysis import SN_TYPES, level_range
+
+# Analysis that is updated one observation at a time, for results that
+# arrive over days. Every observation updates running (Welford) means of its
+# run, of the run's level for each factor and of the whole study, so adding
+# one costs O(factors * responses) and reading the statistics costs
+# O(factors * levels * responses) at any point.
+# Statistics match pyTaguchi.analysis.Analysis once every run is complete.
+
+class IncrementalAnalysis():
+    def __init__(self, table, replicates=1, responses=1, kind="nominal"):
+        if kind not in SN_TYPES:
+            raise ValueError("S/N type should be one of %s" % (SN_TYPES,))
+        self.table = asarray(table)
+        self.kind = kind
+        self.replicates = replicates
+        runs, factors = self.table.shape
+        levels = int(self.table.max()) + 1
+        self._factors = arange(factors)
+        self.seen = zeros((runs, replicates), dtype=bool)
+        # Per run: observations, mean, sum of squared deviations and, for the
+        # smaller/larger S/N ratios, the sum of y**2 or 1/y**2
+        self.run_n = zeros(runs, dtype=int)
+        self.run_mean = zeros((runs, responses))
+        self.run_m2 = zeros((runs, responses))
+        self.run_sq = zeros((runs, responses))
+        self.run_sn = full((runs, responses), nan)
+        # Per factor level: runs observed and the sum of their run means
+        # (main effects), the sum of finite run S/N ratios, and the Welford
+        # mean over single observations (ANOVA)
+        self.level_runs = zeros((factors, levels), dtype=int)
+        self.level_sum = zeros((factors, levels, responses))
+        self.sn_runs = zeros((factors, levels, responses), dtype=int)
+        self.sn_sum = zeros((factors, levels, responses))
+        self.level_n = zeros((factors, levels), dtype=int)
+        self.level_mean = zeros((factors, levels, responses))
+        # Whole study
+        self.n = 0
+        self.mean = zeros(responses)
+        self.m2 = zeros(responses)
+
+    def add(self, run, replicate, response):
+        # response: scalar or one value per response
+        if self.seen[run, replicate]:
+            raise ValueError("Run %d replicate %d already has a response." % (run, replicate))
+        y = zeros(self.mean.shape) + asarray(response, dtype=float)
+        self.seen[run, replicate] = True
+        levels = self.table[run]
+        cells = (self._factors, levels)
+
+        # Run
+        n = self.run_n[run] = self.run_n[run] + 1
+        old = self.run_mean[run].copy()
+        self.run_mean[run] += (y - old) / n
+        self.run_m2[run] += (y - old) * (y - self.run_mean[run])
+        with errstate(divide="ignore"):
+            self.run_sq[run] += y**2 if self.kind == "smaller" else 1 / y**2
+        if n == 1:
+            self.level_runs[cells] += 1
+        self.level_sum[cells] += self.run_mean[run] - old
+
+        # Run S/N: the old value leaves the level sums, the new one enters
+        old_sn, sn = self.run_sn[run], self._sn(run)
+        self.sn_sum[cells] += where(isfinite(sn), sn, 0) - where(isfinite(old_sn), old_sn, 0)
+        self.sn_runs[cells] += isfinite(sn).astype(int) - isfinite(old_sn)
+        self.run_sn[run] = sn
+
+        # Levels and study, per observation
+        self.level_n[cells] += 1
+        self.level_mean[cells] += (y - self.level_mean[cells]) / self.level_n[cells][:, None]
+        self.n += 1
+        delta = y - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (y - self.mean)
+
+    def update(self, observations):
+        # observations: iterable of (run, replicate, response)
+        for run, replicate, response in observations:
+            self.add(run, replicate, response)
+        return self
+
+    def _sn(self, run):
+        n = self.run_n[run]
+        with errstate(divide="ignore", invalid="ignore"):
+            if self.kind == "nominal":
+                if n < 2:
+                    return full(self.mean.shape, nan)
+                return 10 * log10(self.run_mean[run]**2 / (self.run_m2[run] / (n - 1)))
+            return -10 * log10(self.run_sq[run] / n)
+
+    def missing(self):
+        # Run indices still waiting for at least one replicate
+        return (~self.seen.all(axis=1)).nonzero()[0]
+
+    def pending(self):
+        # (run, replicate) pairs without a response
+        return (~self.seen).nonzero()
+
+    @property
+    def complete(self):
+        return bool(self.seen.all())
+
+    @property
+    def counts(self):
+        return self.level_runs
+
+    @property
+    def means(self):
+        # (factors, levels, responses) mean of the run means per level;
+        # NaN for levels without observed runs
+        with errstate(divide="ignore", invalid="ignore"):
+            return self.level_sum / self.level_runs[:, :, None]
+
+    @property
+    def sn_means(self):
+        with errstate(divide="ignore", invalid="ignore"):
+            return self.sn_sum / self.sn_runs
+
+    @property
+    def effects(self):
+        return level_range(self.means)
+
+    @property
+    def sn_effects(self):
+        return level_range(self.sn_means)
+
+    def best_levels(self):
+        return where(isnan(self.sn_means), -inf, self.sn_means).argmax(axis=1)
+
+    @property
+    def anova(self):
+        # Main-effects ANOVA over the observations so far
+        counts = self.level_n[:, :, None]
+        ss = (counts * (self.level_mean - self.mean)**2).sum(axis=1)
+        dof = (self.level_n > 0).sum(axis=1) - 1
+        ss_error = self.m2 - ss.sum(axis=0)
+        dof_error = self.n - 1 - dof.sum()
+        with errstate(divide="ignore", invalid="ignore"):
+            ms = ss / dof[:, None]
+            ms_error = ss_error / dof_error if dof_error > 0 else ss_error * nan
+            f_ratio = ms / ms_error
+            contribution = 100 * ss / self.m2
+        return {
+            "ss": ss,
+            "dof": dof,
+            "ms": ms,
+            "f": f_ratio,
+            "contribution": contribution,
+            "ss_error": ss_error,
+            "dof_error": dof_error,
+            "ss_total": self.m2.copy(),
+        }
+
+    @property
+    def contribution(self):
+        return self.anova["contribution"]
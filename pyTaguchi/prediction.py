@@ -0,0 +1,143 @@
+import heapq
+import math
+
+from numpy import arange, asarray, cumprod, isnan, nan, prod, sqrt
+
+# Additive main-effects model fitted by an Analysis:
+#   y(levels) = grand mean + sum over factors of (level mean - grand mean)
+# Predictions over the full factorial are produced in chunks from a flat
+# combination index, so memory does not grow with the number of combinations.
+# Ref. Ross - Taguchi Techniques for Quality Engineering, ch. 6 (confirmation)
+
+def _betacf(a, b, x):
+    # Continued fraction of the incomplete beta function (modified Lentz)
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for num in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                    -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-14:
+            break
+    return h
+
+def _betainc(a, b, x):
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1 - x) / b
+
+def f_quantile(p, dof1, dof2):
+    # Quantile of the F distribution by bisection on its CDF
+    lo, hi = 0.0, 1.0
+    cdf = lambda f: _betainc(dof1 / 2, dof2 / 2, dof1 * f / (dof1 * f + dof2))
+    while cdf(hi) < p:
+        hi *= 2
+    for _ in range(200):
+        mid = (lo + hi) / 2
+        if cdf(mid) < p:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+MAX_COMBINATIONS = 2**63
+
+class Predictor():
+    def __init__(self, analysis, response=0, target="mean", maximize=True):
+        # target: "mean" (response means) or "sn" (S/N ratios)
+        if target not in ("mean", "sn"):
+            raise ValueError("Target should be 'mean' or 'sn'")
+        self.analysis = analysis
+        self.response = response
+        self.target = target
+        self.maximize = maximize
+        means = analysis.means if target == "mean" else analysis.sn_means
+        values = analysis.responses.mean(axis=1) if target == "mean" else analysis.sn
+        self.grand = float(values[:, response].mean())
+        self.levels = (analysis.counts > 0).sum(axis=1)
+        # (factors, levels) deviations of the level means from the grand mean
+        self.effects = means[:, :, response] - self.grand
+        self.effects[isnan(self.effects)] = 0
+        self.combinations = int(prod(self.levels.astype(object)))
+        # Mixed-radix place values; enumeration needs fewer than 2**63
+        # combinations (int64 flat indices), see _check_enumerable
+        if self.combinations < MAX_COMBINATIONS:
+            self.radix = cumprod([1] + self.levels[::-1].tolist()[:-1])[::-1]
+        else:
+            self.radix = None
+
+    def _check_enumerable(self):
+        if self.radix is None:
+            raise ValueError("%d combinations cannot be enumerated (limit 2**63); "
+                             "use optimum(), which needs no enumeration." % self.combinations)
+
+    def predict(self, levels):
+        # (n, factors) level indices -> (n,) predictions
+        levels = asarray(levels)
+        return self.grand + self.effects[arange(self.effects.shape[0]), levels].sum(axis=-1)
+
+    def decode(self, index):
+        # Flat combination index -> (n, factors) level indices
+        self._check_enumerable()
+        index = asarray(index)
+        return (index[:, None] // self.radix) % self.levels
+
+    def chunks(self, size=65536):
+        self._check_enumerable()
+        for first in range(0, self.combinations, size):
+            levels = self.decode(arange(first, min(first + size, self.combinations)))
+            yield levels, self.predict(levels)
+
+    def top(self, k=10, size=65536):
+        # k best combinations as (prediction, levels), best first. Each chunk
+        # is reduced with argpartition before entering a size-k heap.
+        sign = 1 if self.maximize else -1
+        heap = []
+        for levels, predicted in self.chunks(size):
+            if predicted.size > k:
+                keep = (sign * predicted).argpartition(-k)[-k:]
+                levels, predicted = levels[keep], predicted[keep]
+            for row, value in zip(levels.tolist(), predicted.tolist()):
+                item = (sign * value, tuple(row))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return [(sign * value, levels) for value, levels in sorted(heap, reverse=True)]
+
+    def optimum(self, alpha=0.05):
+        # The model is separable, so the best combination is the best level
+        # of each factor on its own; no enumeration needed
+        effects = self.effects.copy()
+        mask = arange(effects.shape[1])[None, :] >= self.levels[:, None]
+        effects[mask] = -float("inf") if self.maximize else float("inf")
+        levels = effects.argmax(axis=1) if self.maximize else effects.argmin(axis=1)
+        predicted = float(self.predict(levels[None, :])[0])
+        return levels, predicted, self.interval(predicted, alpha)
+
+    def interval(self, predicted, alpha=0.05):
+        # Confidence interval of a predicted mean, with Taguchi's effective
+        # number of replications n_eff = N / (1 + dof of the model terms)
+        if self.target != "mean":
+            return (nan, nan)
+        anova = self.analysis.anova
+        dof_error = anova["dof_error"]
+        if dof_error <= 0:
+            return (nan, nan)
+        ms_error = anova["ss_error"][self.response] / dof_error
+        runs, reps, _ = self.analysis.responses.shape
+        n_eff = runs * reps / (1 + anova["dof"].sum())
+        half = float(sqrt(f_quantile(1 - alpha, 1, dof_error) * ms_error / n_eff))
+        return (predicted - half, predicted + half)
@@ -0,0 +1,87 @@
+import contextvars
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Per-stage instrumentation of Taguchi.run and the lazy DataFrame/plot builds.
+# Each stage produces a record {stage, design, time, allocated, size} that is
+# stored on the Taguchi object (tg.stats), passed to its hooks and added to
+# every active Profile.
+
+_profiles = contextvars.ContextVar("pyTaguchi_profiles", default=())
+
+def active():
+    return _profiles.get()
+
+def timed(owner, stage, func, size=None):
+    # size(result) -> bytes produced by the stage, measured after it ran
+    profiles = active()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    record = {
+        "stage": stage,
+        "design": getattr(owner, "design", None),
+        "time": elapsed,
+        "allocated": tracemalloc.get_traced_memory()[1] - before if tracing else None,
+        "size": size(result) if size is not None else None,
+    }
+    owner.stats.append(record)
+    for hook in owner.hooks:
+        hook(record)
+    for profile in profiles:
+        profile.add(record)
+    return result
+
+class Profile():
+    def __init__(self):
+        self.records = []
+        self.start = time.perf_counter()
+
+    def add(self, record):
+        self.records.append(dict(record, t=time.perf_counter() - self.start))
+
+    def to_dict(self):
+        # {stage: {calls, total, mean, max, allocated, size}}
+        summary = {}
+        for record in self.records:
+            s = summary.setdefault(record["stage"], {"calls": 0, "total": 0.0, "max": 0.0,
+                                                     "allocated": 0, "size": 0})
+            s["calls"] += 1
+            s["total"] += record["time"]
+            s["max"] = max(s["max"], record["time"])
+            s["allocated"] += record["allocated"] or 0
+            s["size"] += record["size"] or 0
+        for s in summary.values():
+            s["mean"] = s["total"] / s["calls"]
+        return summary
+
+    def to_trace(self, path):
+        # Chrome trace-event format, opens in chrome://tracing or Perfetto
+        events = [{"name": r["stage"], "cat": str(r["design"]), "ph": "X", "pid": 0, "tid": 0,
+                   "ts": (r["t"] - r["time"]) * 1e6, "dur": r["time"] * 1e6,
+                   "args": {"allocated": r["allocated"], "size": r["size"]}}
+                  for r in self.records]
+        with open(path, "w") as fh:
+            json.dump({"traceEvents": events}, fh)
+
+@contextmanager
+def profile(memory=False):
+    # Aggregates stage records of every Taguchi run inside the block.
+    # memory=True also traces allocations (noticeably slower).
+    p = Profile()
+    token = _profiles.set(active() + (p,))
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield p
+    finally:
+        if started:
+            tracemalloc.stop()
+        _profiles.reset(token)
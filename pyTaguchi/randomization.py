@@ -0,0 +1,23 @@
+from numpy import asarray, broadcast_to, lexsort, random, unique
+
+# Seeded run-order randomization. Every call draws from its own Generator, so
+# orders are reproducible and nothing touches numpy's global RNG.
+
+def as_generator(seed=None):
+    if isinstance(seed, random.Generator):
+        return seed
+    return random.default_rng(seed)
+
+def permutations(runs, replicates=1, seed=None, blocks=None):
+    # (replicates, runs) independent run orders from one draw of random keys.
+    # With blocks (one label per run), runs are only shuffled within their
+    # block and blocks stay in order of first appearance.
+    keys = as_generator(seed).random((replicates, runs))
+    if blocks is None:
+        return keys.argsort(axis=1)
+    blocks = asarray(blocks)
+    if blocks.shape != (runs,):
+        raise ValueError("One block label per run is required!")
+    _, first, inverse = unique(blocks, return_index=True, return_inverse=True)
+    block_ids = first.argsort().argsort()[inverse.reshape(-1)]
+    return lexsort((keys, broadcast_to(block_ids, keys.shape)))
@@ -0,0 +1,140 @@
+import html
+import os
+from threading import Lock
+
+from numpy import asarray
+
+from pyTaguchi.export import run_labels
+
+# Design sheets rendered straight from the level-index table. Each level is
+# formatted once per column and the runs are gathered from those strings, so
+# the cost is linear in the number of cells. Images draw the page as a single
+# monospaced text block on a figure template that is reused between pages
+# and calls instead of building a matplotlib table cell by cell.
+
+ROWS_PER_PAGE = 50
+FONT_SIZE = 9
+# Monospaced glyph width and line height in inches at FONT_SIZE; the width
+# allows for hinting, which rounds glyph advances up at low dpi
+CHAR_WIDTH = 0.65 * FONT_SIZE / 72
+LINE_HEIGHT = 1.25 * FONT_SIZE / 72
+MARGIN = 0.3
+
+def _design(source):
+    return getattr(source, "result", source)
+
+def _title(design):
+    return "Taguchi table " + design.name
+
+def _columns(design, rows, cell):
+    # -> header cells, one gathered string array per column (labels first)
+    start, stop, _ = rows.indices(design.runs)
+    labels = run_labels(max(stop - start, 0), start).tolist()
+    header = [""] + [str(name) for name in design.columns]
+    texts = [[str(value) for value in lookup.tolist()] for lookup in design.lookups]
+    widths = [len("RUN %d" % design.runs)] + [max([len(header[i + 1])] + [len(t) for t in text])
+                                  for i, text in enumerate(texts)]
+    table = design.table[rows]
+    columns = [asarray([cell(label, widths[0], True) for label in labels])]
+    for i, text in enumerate(texts):
+        formatted = asarray([cell(t, widths[i + 1], False) for t in text])
+        columns.append(formatted[table[:, i]])
+    return [cell(name, width, True) for name, width in zip(header, widths)], columns
+
+def _text_cell(value, width, label):
+    return value.ljust(width) if label else value.rjust(width)
+
+def _lines(design, rows):
+    header, columns = _columns(design, rows, _text_cell)
+    head = "  ".join(header)
+    return [head, "-" * len(head)] + ["  ".join(row) for row in zip(*columns)]
+
+def to_text(source, start=0, stop=None):
+    design = _design(source)
+    return "\n".join(_lines(design, slice(start, stop))) + "\n"
+
+def _html_cell(value, width, label):
+    tag = "th" if label else "td"
+    return "<%s>%s</%s>" % (tag, html.escape(value), tag)
+
+def to_html(source, start=0, stop=None):
+    design = _design(source)
+    header, columns = _columns(design, slice(start, stop), _html_cell)
+    body = ["<tr>%s</tr>" % "".join(row) for row in zip(*columns)]
+    return ('<table class="taguchi">\n<caption>%s</caption>\n<thead><tr>%s</tr></thead>\n'
+            "<tbody>\n%s\n</tbody>\n</table>\n"
+            % (html.escape(_title(design)), "".join(header), "\n".join(body)))
+
+def pages(source, rows=ROWS_PER_PAGE):
+    return -(-_design(source).runs // rows)
+
+class _Template():
+    # A figure sized for (characters, lines) with its title and body text
+    # artists created once; pages only swap the strings
+    def __init__(self, chars, lines):
+        from matplotlib.figure import Figure
+        width = (chars + 1) * CHAR_WIDTH + 2 * MARGIN
+        height = (lines + 2) * LINE_HEIGHT + 2 * MARGIN
+        self.figure = Figure(figsize=(width, height))
+        top = 1 - MARGIN / height
+        self.title = self.figure.text(0.5, top, "", ha="center", va="top", fontsize=FONT_SIZE + 2)
+        self.body = self.figure.text(MARGIN / width, top - 2 * LINE_HEIGHT / height, "",
+                                     ha="left", va="top", family="monospace",
+                                     fontsize=FONT_SIZE, linespacing=1.25)
+
+    def fill(self, title, lines):
+        self.title.set_text(title)
+        self.body.set_text("\n".join(lines))
+        return self.figure
+
+TEMPLATES = 32
+_templates = {}
+_lock = Lock()
+
+def _template(chars, lines):
+    # Cached template for a page size; callers hold _lock while they fill
+    # and save it
+    key = (chars, lines)
+    if key not in _templates:
+        if len(_templates) >= TEMPLATES:
+            _templates.pop(next(iter(_templates)))
+        _templates[key] = _Template(*key)
+    return _templates[key]
+
+def figure(source, page=0, rows=None):
+    # A new Figure for one page (all runs by default) that the caller owns,
+    # e.g. for display; saving goes through the cached templates instead
+    design = _design(source)
+    rows = rows or design.runs
+    lines = _lines(design, slice(page * rows, (page + 1) * rows))
+    return _Template(len(lines[0]), len(lines)).fill(_title(design), lines)
+
+def save_pages(source, path, rows=ROWS_PER_PAGE, **kwargs):
+    # One image per page ("sheet.png" -> "sheet-1.png", ...) or a single
+    # multi-page PDF. Returns the written paths. A single page may also be
+    # written to a file object.
+    design = _design(source)
+    count = pages(design, rows)
+    title = _title(design)
+    pdf = str(path).lower().endswith(".pdf")
+    base, ext = os.path.splitext(str(path))
+    written = []
+    with _lock:
+        if pdf:
+            from matplotlib.backends.backend_pdf import PdfPages
+            out = PdfPages(path)
+        for page in range(count):
+            lines = _lines(design, slice(page * rows, (page + 1) * rows))
+            # Short last pages reuse the full-page template
+            template = _template(len(lines[0]), min(rows, design.runs) + 2)
+            fig = template.fill("%s (%d/%d)" % (title, page + 1, count) if count > 1 else title, lines)
+            if pdf:
+                out.savefig(fig, **kwargs)
+            else:
+                target = "%s-%d%s" % (base, page + 1, ext) if count > 1 else path
+                fig.savefig(target, **kwargs)
+                written.append(target)
+        if pdf:
+            out.close()
+            written.append(str(path))
+    return written
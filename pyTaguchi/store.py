@@ -0,0 +1,108 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# On-disk result store (SQLite) keyed by design hash, run and replicate.
+# Runs are identified by their original (unrandomized) run index, so a
+# campaign can be resumed with a different run order.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS studies (
+    design TEXT PRIMARY KEY,
+    name TEXT,
+    array TEXT,
+    variables TEXT,
+    created REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    design TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    replicate INTEGER NOT NULL,
+    value TEXT,
+    time REAL,
+    attempts INTEGER,
+    created REAL,
+    PRIMARY KEY (design, run, replicate)
+);
+CREATE INDEX IF NOT EXISTS results_created ON results (created);
+"""
+
+def design_hash(array_name, variables):
+    # Same array and same variables -> same key, whatever the run order
+    spec = [array_name] + [[variable.name, list(variable.values)] for variable in variables]
+    return hashlib.sha1(json.dumps(spec, default=str).encode()).hexdigest()
+
+def _plain(value):
+    # json default: NumPy scalars and arrays (typical simulator results)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError("Result of type %s is not JSON serializable" % type(value).__name__)
+
+class ResultStore():
+    def __init__(self, path):
+        self.path = str(path)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_study(self, design, array_name, variables, name=None):
+        spec = [[variable.name, list(variable.values)] for variable in variables]
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO studies VALUES (?, ?, ?, ?, ?)",
+                (design, name, array_name, json.dumps(spec, default=str), time.time()))
+
+    def put(self, design, run, replicate, value, elapsed=None, attempts=1):
+        # One committed transaction per run: a crash loses at most the run
+        # in flight
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (design, run, replicate, json.dumps(value, default=_plain), elapsed, attempts, time.time()))
+
+    def load(self, design):
+        # {(run, replicate): (value, time, attempts)}
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT run, replicate, value, time, attempts FROM results WHERE design = ?",
+                (design,)).fetchall()
+        return {(run, rep): (json.loads(value), elapsed, attempts)
+                for run, rep, value, elapsed, attempts in rows}
+
+    def completed(self, design):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT run, replicate FROM results WHERE design = ?", (design,)).fetchall()
+        return set(rows)
+
+    def studies(self):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT s.design, s.name, s.array, s.created, COUNT(r.run) FROM studies s "
+                "LEFT JOIN results r ON r.design = s.design GROUP BY s.design").fetchall()
+        return [dict(zip(("design", "name", "array", "created", "results"), row)) for row in rows]
+
+    def query(self, design=None, run=None, since=None):
+        # Indexed lookups across studies without loading everything
+        clauses, params = [], []
+        for column, op, value in (("design", "=", design), ("run", "=", run), ("created", ">=", since)):
+            if value is not None:
+                clauses.append("%s %s ?" % (column, op))
+                params.append(value)
+        sql = "SELECT design, run, replicate, value, time, attempts, created FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self.lock:
+            rows = self.connection.execute(sql + " ORDER BY design, run, replicate", params).fetchall()
+        return [(d, r, rep, json.loads(v), t, a, c) for d, r, rep, v, t, a, c in rows]
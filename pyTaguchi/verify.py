@@ -0,0 +1,128 @@
+from itertools import combinations, islice
+
+from numpy import (abs as absolute, ascontiguousarray, asarray, bincount, concatenate, corrcoef, cumsum,
+                   errstate, int64, logical_and, nan_to_num, ones, prod, repeat, triu_indices)
+
+# Checks for level-index arrays (built-in, generated or user-supplied).
+# Every count is a bincount over combined keys: the levels of a column subset
+# are packed into one integer per run and offset per subset, so all subsets
+# of a chunk are counted in a single call.
+
+def column_levels(table):
+    return table.max(axis=0).astype(int) + 1
+
+def as_table(table):
+    table = asarray(table)
+    if table.ndim != 2 or table.size == 0:
+        raise ValueError("Array should be a non-empty (runs, columns) table.")
+    if table.dtype.kind not in "iu" or table.min() < 0:
+        raise ValueError("Array should hold zero-based integer level indices.")
+    return table
+
+def balance(table):
+    # Per column: every level appears equally often
+    table = as_table(table)
+    runs, cols = table.shape
+    col_levels = column_levels(table)
+    offsets = concatenate(([0], cumsum(col_levels)[:-1]))
+    counts = bincount((table + offsets).ravel(), minlength=col_levels.sum())
+    expected = repeat(runs / col_levels, col_levels)
+    return logical_and.reduceat(counts == expected, offsets)
+
+def subset_orthogonal(table, subsets):
+    # subsets: (n, t) column indices -> (n,) True where every level
+    # combination of the t columns appears equally often
+    table = as_table(table)
+    subsets = asarray(subsets, dtype=int64).reshape(len(subsets), -1)
+    if len(subsets) == 0:
+        return ones(0, dtype=bool)
+    runs = table.shape[0]
+    col_levels = column_levels(table)
+    sizes = col_levels[subsets]
+    cells = prod(sizes, axis=1)
+    offsets = concatenate(([0], cumsum(cells)[:-1]))
+    # (subsets, runs) keys, built from the transposed table so every gather
+    # reads contiguous rows
+    columns = ascontiguousarray(table.T)
+    keys = columns[subsets[:, 0]].astype(int64)
+    for k in range(1, subsets.shape[1]):
+        keys *= sizes[:, k, None]
+        keys += columns[subsets[:, k]]
+    keys += offsets[:, None]
+    counts = bincount(keys.ravel(), minlength=int(cells.sum()))
+    expected = repeat(runs // cells, cells)
+    return (runs % cells == 0) & logical_and.reduceat(counts == expected, offsets)
+
+def pairwise(table):
+    # (columns, columns) matrix, True where the two columns are orthogonal
+    table = as_table(table)
+    cols = table.shape[1]
+    i, j = triu_indices(cols, 1)
+    ok = subset_orthogonal(table, concatenate([i[:, None], j[:, None]], axis=1))
+    out = ones((cols, cols), dtype=bool)
+    out[i, j] = ok
+    out[j, i] = ok
+    return out
+
+def is_orthogonal(table):
+    # Strength 2: balanced columns and every pair of columns orthogonal
+    return bool(balance(table).all() and pairwise(table).all())
+
+def has_strength(table, t, chunk=4096):
+    # Every set of t columns shows each level combination equally often
+    table = as_table(table)
+    if t > table.shape[1]:
+        return False
+    subsets = combinations(range(table.shape[1]), t)
+    while True:
+        block = list(islice(subsets, chunk))
+        if not block:
+            return True
+        if not subset_orthogonal(table, block).all():
+            return False
+
+def strength(table, max_strength=3):
+    # Largest t <= max_strength the array has (0 if not even balanced)
+    table = as_table(table)
+    if not balance(table).all():
+        return 0
+    t = 1
+    while t < min(max_strength, table.shape[1]) and has_strength(table, t + 1):
+        t += 1
+    return t
+
+def correlation(table):
+    # Pearson correlation between columns coded by level index
+    table = as_table(table)
+    with errstate(divide="ignore", invalid="ignore"):
+        return nan_to_num(corrcoef(table.T.astype(float)))
+
+def aliases(table, threshold=1e-9):
+    # Confounding of main effects with two-factor interactions for 2-level
+    # columns: {column: [(i, j, correlation), ...]}. +-1 is full aliasing,
+    # fractions are partial (e.g. +-1/3 in Plackett-Burman arrays).
+    table = as_table(table)
+    two = [c for c, n in enumerate(column_levels(table)) if n == 2]
+    x = 1 - 2 * table[:, two].astype(float)
+    i, j = triu_indices(len(two), 1)
+    corr = x.T @ (x[:, i] * x[:, j]) / table.shape[0]
+    out = {}
+    for k, p in zip(*(absolute(corr) > threshold).nonzero()):
+        if k != i[p] and k != j[p]:
+            out.setdefault(two[k], []).append((two[i[p]], two[j[p]], float(corr[k, p])))
+    return out
+
+def verify(table, max_strength=3):
+    table = as_table(table)
+    balanced = balance(table)
+    pairs = pairwise(table)
+    return {
+        "runs": table.shape[0],
+        "columns": table.shape[1],
+        "levels": column_levels(table).tolist(),
+        "balanced": balanced,
+        "pairwise": pairs,
+        "orthogonal": bool(balanced.all() and pairs.all()),
+        "strength": strength(table, max_strength),
+        "correlation": correlation(table),
+    }
@@ -15,6 +15,9 @@ setuptools.setup(
   url = 'https://github.com/rbngpp/pyTaguchi', 
   download_url = 'https://github.com/rbngpp/pyTaguchi/archive/refs/tags/v0.4.tar.gz',
   keywords = ['DOE', 'TAGUCHI', 'DESIGN', 'EXPERIMENT', 'R&D'],  
+  entry_points={
+      'console_scripts': ['pytaguchi=pyTaguchi.cli:main'],
+  },
   install_requires=[           
           'numpy',
           'pandas',